@@ -29,37 +29,132 @@ SOFTWARE.
 
 
 import argparse
+import bz2
+import concurrent.futures
+import contextlib
 import datetime
-import errno
-import glob
+import functools
+import gzip
+import http.client
+import itertools
+import json
 import logging
+import lzma
 import os
-import pathlib
+import re
 import shlex
+import shutil
 import subprocess
 import sys
+import tarfile
 import urllib.error
 import urllib.parse
 import urllib.request
+import zlib
 
-from typing import override
+from collections.abc import Iterator
+from typing import BinaryIO, override
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from . import __version__
 
 
-# Enable logging
-logging.basicConfig(level=logging.DEBUG, format="[%(levelname)-8s]  %(message)s")
+# Enable logging, main() raises the level with -v/--verbose
+logging.basicConfig(level=logging.WARNING, format="[%(levelname)-8s]  %(message)s")
+
+# Logging levels selected by the number of -v/--verbose flags
+VERBOSITY_LEVELS = (logging.WARNING, logging.INFO, logging.DEBUG)
+
+# Buffer size used when streaming decompressed data to disk
+COPY_BUFSIZE = 1024 * 1024
+
+# Capacity requested for pipes feeding an extract command, the largest
+# size Linux grants unprivileged processes by default
+PIPE_BUFSIZE = 1024 * 1024
+
+# Largest zstd window accepted, matching zstd --long=31, so archives
+# compressed with long distance matching can be decompressed
+ZSTD_MAX_WINDOW = 1 << 31
+
+# Maximum number of archives downloaded at the same time
+MAX_DOWNLOADS = 16
+
+# Archives at least this large are downloaded over several connections
+PARALLEL_DOWNLOAD_SIZE = 64 * 1024 * 1024
+
+# Number of connections used for a parallel download
+PARALLEL_CONNECTIONS = 16
+
+# Download programs for non-http urls and fallbacks, in order of preference
+DOWNLOAD_PROGRAMS = ("curl", "wget", "fetch")
+
+# Suffix of archives that are still being downloaded
+PARTIAL_SUFFIX = ".part"
+
+# Suffix of the sidecar files storing a downloaded archive's HTTP metadata
+METADATA_SUFFIX = ".meta.json"
+
+# Appended to the target of an archive whose name has no suffix to remove,
+# so extracting it never overwrites the archive itself
+EXTRACTED_SUFFIX = ".out"
+
+# Multi-threaded decompressors, preferred over the in-process codecs
+PARALLEL_DECOMPRESSORS = frozenset(("pigz", "pbzip2", "lbzip2", "pixz"))
+
+# Extract commands that would prompt before replacing existing files, as
+# (overwrite, keep existing) command lines used in place of COMMAND_TABLE's,
+# lha has no option to keep existing files
+OVERWRITE_COMMANDS = {
+    "unzip": ("unzip -o", "unzip -n"),
+    "unrar": ("unrar x -o+", "unrar x -o-"),
+    "7z": ("7z x -y", "7z x -aos"),
+    "lha": ("lha xf", "lha x"),
+}
+
+# tarfile stream mode compression names of the in-process codecs
+TARFILE_COMPRESSION = {"gzip": "gz", "bz2": "bz2", "xz": "xz"}
+
+# Errors raised by the in-process decompressors on corrupt or truncated archives
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (
+    OSError,
+    EOFError,
+    lzma.LZMAError,
+    tarfile.TarError,
+    zlib.error,
+) + ((zstandard.ZstdError,) if zstandard is not None else ())
 
 
 class ArchiveCommand:
     """Object for storing information needed to extract archives."""
 
+    __slots__ = (
+        "extract_cmd",
+        "pipe_cmd",
+        "extract_argv",
+        "pipe_argv",
+        "uses_stdin",
+        "uses_stdout",
+        "codec",
+        "is_tar",
+    )
+
     def __init__(
         self,
         extract_cmd: str = "",
         pipe_cmd: str = "",
         uses_stdin: bool = False,
         uses_stdout: bool = False,
+        codec: str = "",
+        is_tar: bool = False,
     ) -> None:
         """Set attributes for decompression and piping.
 
@@ -67,14 +162,20 @@ class ArchiveCommand:
         @param pipe_cmd: command string to pipe
         @param uses_stdin: boolean value if extract_cmd uses stdin
         @param uses_stdout: boolean value extract_cmd uses stdout
+        @param codec: name of the compression codec for in-process extraction
+        @param is_tar: boolean value if the decompressed stream is a tar archive
 
         @return: None
         """
 
         self.extract_cmd: str = extract_cmd
         self.pipe_cmd: str = pipe_cmd
+        self.extract_argv: list[str] = shlex.split(extract_cmd)
+        self.pipe_argv: list[str] = shlex.split(pipe_cmd) if pipe_cmd else []
         self.uses_stdin: bool = uses_stdin
         self.uses_stdout: bool = uses_stdout
+        self.codec: str = codec
+        self.is_tar: bool = is_tar
 
     @override
     def __repr__(self) -> str:
@@ -83,11 +184,14 @@ class ArchiveCommand:
         @return: string representing ArchiveCommand
         """
 
-        msg = f"[ extract_cmd = {self.extract_cmd!r} "
-        msg += f"pipe_cmd = {self.pipe_cmd!r} "
-        msg += f"uses_stdin = {self.uses_stdin!r} "
-        msg += f"uses_stdout = {self.uses_stdout!r} ] "
-        return msg
+        return (
+            f"[ extract_cmd = {self.extract_cmd!r} "
+            f"pipe_cmd = {self.pipe_cmd!r} "
+            f"uses_stdin = {self.uses_stdin!r} "
+            f"uses_stdout = {self.uses_stdout!r} "
+            f"codec = {self.codec!r} "
+            f"is_tar = {self.is_tar!r} ] "
+        )
 
     @override
     def __str__(self) -> str:
@@ -96,11 +200,26 @@ class ArchiveCommand:
         @return: string representing ArchiveCommand
         """
 
-        msg = f"[ extract_cmd = {self.extract_cmd} "
-        msg += f"pipe_cmd = {self.pipe_cmd} "
-        msg += f"uses_stdin = {self.uses_stdin} "
-        msg += f"uses_stdout = {self.uses_stdout} ] "
-        return msg
+        return (
+            f"[ extract_cmd = {self.extract_cmd} "
+            f"pipe_cmd = {self.pipe_cmd} "
+            f"uses_stdin = {self.uses_stdin} "
+            f"uses_stdout = {self.uses_stdout} "
+            f"codec = {self.codec} "
+            f"is_tar = {self.is_tar} ] "
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def command_path(path: str) -> str | None:
+    """Find the absolute path of an external command.
+
+    @param path: external command to look up on PATH
+
+    @return: absolute path of the command, None if it is not installed
+    """
+
+    return shutil.which(path)
 
 
 def command_exists(path: str) -> bool:
@@ -111,16 +230,237 @@ def command_exists(path: str) -> bool:
     @return: boolean value True if cmd exists, False otherwise
     """
 
-    try:
-        with subprocess.Popen(
-            [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        ) as _:
-            pass
-    except OSError as e:
-        if e.errno == errno.ENOENT:
-            return False
+    return command_path(path) is not None
 
-    return True
+
+def resolve_command(argv: list[str]) -> list[str]:
+    """Replace a command line's program with its absolute path.
+
+    @param argv: command line split into arguments
+
+    @return: command line that can be executed without a PATH search
+    """
+
+    return [command_path(argv[0]) or argv[0]] + argv[1:]
+
+
+def command_programs(argv: list[str]) -> list[str]:
+    """List the programs a command line runs.
+
+    @param argv: command line split into arguments
+
+    @return: the command's program followed by any program given to tar with -I
+    """
+
+    programs = [argv[0]]
+    programs += [
+        shlex.split(value)[0] for opt, value in itertools.pairwise(argv) if opt == "-I"
+    ]
+    return programs
+
+
+def preferred_command(*commands: str) -> str:
+    """Pick the first command line whose program is installed.
+
+    @param commands: command strings in order of preference
+
+    @return: first available command string, the last one if none are found
+    """
+
+    for command in commands:
+        # programs given to tar with -I must be installed as well
+        programs = command_programs(shlex.split(command))
+        if all(command_exists(program) for program in programs):
+            return command
+
+    return commands[-1]
+
+
+# Map filename suffixes to the commands used to extract them,
+# compound tar suffixes come first so .tar.gz is not matched as .gz
+COMMAND_TABLE: tuple[tuple[tuple[str, ...], ArchiveCommand], ...] = (
+    (
+        (".tar.bz2", ".tbz2", ".tbz"),
+        ArchiveCommand(
+            extract_cmd=preferred_command(
+                "tar -I lbzip2 -xvf -", "tar -I pbzip2 -xvf -", "tar -xvjf -"
+            ),
+            uses_stdin=True,
+            codec="bz2",
+            is_tar=True,
+        ),
+    ),
+    (
+        (".tar.gz", ".tgz"),
+        ArchiveCommand(
+            extract_cmd=preferred_command("tar -I pigz -xvf -", "tar -xvzf -"),
+            uses_stdin=True,
+            codec="gzip",
+            is_tar=True,
+        ),
+    ),
+    (
+        (".tar.xz", ".txz"),
+        ArchiveCommand(
+            extract_cmd=preferred_command("tar -I pixz -xvf -", "tar -xvJf -"),
+            uses_stdin=True,
+            codec="xz",
+            is_tar=True,
+        ),
+    ),
+    (
+        (".tar.lzma",),
+        ArchiveCommand(
+            extract_cmd="tar -xvJf -", uses_stdin=True, codec="xz", is_tar=True
+        ),
+    ),
+    (
+        (".tar.zst",),
+        ArchiveCommand(
+            extract_cmd=preferred_command(
+                "tar -I 'zstd -d --long=31' -xvf -", "tar --zstd -xvf -"
+            ),
+            uses_stdin=True,
+            codec="zstd",
+            is_tar=True,
+        ),
+    ),
+    (
+        (".tar",),
+        ArchiveCommand(extract_cmd="tar -xvf -", uses_stdin=True, is_tar=True),
+    ),
+    ((".rar",), ArchiveCommand(extract_cmd="unrar x")),
+    ((".lzh",), ArchiveCommand(extract_cmd="lha x")),
+    ((".7z",), ArchiveCommand(extract_cmd="7z x")),
+    ((".zip", ".jar"), ArchiveCommand(extract_cmd="unzip")),
+    ((".rpm",), ArchiveCommand(extract_cmd="rpm2cpio -", pipe_cmd="cpio -idvm")),
+    ((".deb",), ArchiveCommand(extract_cmd="ar -x")),
+    (
+        (".bz2",),
+        ArchiveCommand(
+            extract_cmd=preferred_command(
+                "lbzip2 -d -c -", "pbzip2 -d -c -", "bzip2 -d -c -"
+            ),
+            uses_stdin=True,
+            uses_stdout=True,
+            codec="bz2",
+        ),
+    ),
+    (
+        (".gz",),
+        ArchiveCommand(
+            extract_cmd=preferred_command("pigz -d -c -", "gzip -d -c -"),
+            uses_stdin=True,
+            uses_stdout=True,
+            codec="gzip",
+        ),
+    ),
+    (
+        (".z",),
+        ArchiveCommand(
+            extract_cmd=preferred_command("pigz -d -c -", "gzip -d -c -"),
+            uses_stdin=True,
+            uses_stdout=True,
+        ),
+    ),
+    (
+        (".xz",),
+        ArchiveCommand(
+            extract_cmd=preferred_command("pixz -d", "xz -d -c -"),
+            uses_stdin=True,
+            uses_stdout=True,
+            codec="xz",
+        ),
+    ),
+    (
+        (".lzma",),
+        ArchiveCommand(
+            extract_cmd="xz -d -c -", uses_stdin=True, uses_stdout=True, codec="xz"
+        ),
+    ),
+    (
+        (".zst",),
+        ArchiveCommand(
+            extract_cmd="zstd -d --long=31 -c -",
+            uses_stdin=True,
+            uses_stdout=True,
+            codec="zstd",
+        ),
+    ),
+)
+
+
+# Map each individual suffix in COMMAND_TABLE to its command
+SUFFIX_COMMANDS: dict[str, ArchiveCommand] = {
+    suffix: command for suffixes, command in COMMAND_TABLE for suffix in suffixes
+}
+
+# Match any COMMAND_TABLE suffix at the end of a filename in one pass,
+# longer suffixes are tried first so .tar.gz is not matched as .gz
+COMMAND_SUFFIX_RE = re.compile(
+    "(?:"
+    + "|".join(map(re.escape, sorted(SUFFIX_COMMANDS, key=len, reverse=True)))
+    + ")$",
+    re.IGNORECASE,
+)
+
+# Signatures identifying archive formats as (offset, magic bytes, format)
+MAGIC_NUMBERS: tuple[tuple[int, bytes, str], ...] = (
+    (0, b"\x1f\x8b", "gzip"),
+    (0, b"BZh", "bz2"),
+    (0, b"\xfd7zXZ\x00", "xz"),
+    (0, b"\x28\xb5\x2f\xfd", "zstd"),
+    (0, b"\x1f\x9d", "compress"),
+    (0, b"PK\x03\x04", "zip"),
+    (0, b"7z\xbc\xaf\x27\x1c", "7z"),
+    (0, b"Rar!\x1a\x07", "rar"),
+    (0, b"\xed\xab\xee\xdb", "rpm"),
+    (0, b"!<arch>\n", "deb"),
+    (2, b"-lh", "lzh"),
+    (257, b"ustar", "tar"),
+)
+
+# Filename suffixes of each archive format, compressed tar suffixes first
+FORMAT_SUFFIXES: dict[str, tuple[str, ...]] = {
+    "gzip": (".tar.gz", ".tgz", ".gz"),
+    "bz2": (".tar.bz2", ".tbz2", ".tbz", ".bz2"),
+    "xz": (".tar.xz", ".txz", ".xz"),
+    "zstd": (".tar.zst", ".zst"),
+    "compress": (".z",),
+    "zip": (".zip", ".jar"),
+    "7z": (".7z",),
+    "rar": (".rar",),
+    "rpm": (".rpm",),
+    "deb": (".deb",),
+    "lzh": (".lzh",),
+    "tar": (".tar",),
+}
+
+
+# Trailing extension suffixes removed from an archive name to form its target
+ARCHIVE_SUFFIX_RE = re.compile(
+    r"(?:\.(?:tar|tbz2?|tgz|txz|rar|lzh|7z|zip|jar|rpm|deb|bz2|gz|z|xz|lzma|zst))+$",
+    re.IGNORECASE,
+)
+
+# Urls with a scheme, a host and a path, fragments are never sent to servers
+URL_RE = re.compile(r"[a-z][a-z0-9+.\-]*://[^/?#]+/[^#]*", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=64)
+def find_command(filename: str) -> ArchiveCommand | None:
+    """Find the ArchiveCommand for an archive by its filename.
+
+    @param filename: archive filename without directories
+
+    @return: matching ArchiveCommand or None
+    """
+
+    match = COMMAND_SUFFIX_RE.search(filename)
+    if match is None:
+        return None
+
+    return SUFFIX_COMMANDS[match.group().lower()]
 
 
 def strip_suffix(archive: str) -> str:
@@ -131,37 +471,255 @@ def strip_suffix(archive: str) -> str:
     @return: complete archive path with extension suffixes removed.
     """
 
-    # Valid extension suffixes
-    valid_suffixes = (
-        ".tbz2",
-        ".tbz",
-        ".tgz",
-        ".txz",
-        ".tar",
-        ".rar",
-        ".lzh",
-        ".7z",
-        ".zip",
-        ".jar",
-        ".rpm",
-        ".deb",
-        ".bz2",
-        ".gz",
-        ".Z",
-        ".xz",
-        ".lzma",
-        ".zst",
-    )
-
-    target_path = pathlib.PurePath(archive)
-    target = target_path.stem
-    for suffix in target_path.suffixes:
-        if suffix in valid_suffixes:
-            target = target.removesuffix(suffix)
+    # strip every trailing archive suffix at once, e.g. .tar.gz, falling
+    # back to the last suffix for archives identified by their contents
+    name = os.path.basename(archive)
+    target = ARCHIVE_SUFFIX_RE.sub("", name)
+    if target in ("", name):
+        target = os.path.splitext(name)[0]
+    if target in ("", name):
+        target = name + EXTRACTED_SUFFIX
 
     return target
 
 
+def can_extract_in_process(archive_cmd: ArchiveCommand) -> bool:
+    """Test if an archive can be extracted without external tools.
+
+    @param archive_cmd: a completed ArchiveCommand object
+
+    @return: boolean True if a usable in-process codec exists, False otherwise
+    """
+
+    # an installed multi-threaded decompressor outruns the in-process codecs
+    if not PARALLEL_DECOMPRESSORS.isdisjoint(
+        command_programs(archive_cmd.extract_argv)
+    ):
+        return False
+
+    if archive_cmd.codec == "zstd":
+        return zstandard is not None
+
+    return archive_cmd.is_tar or bool(archive_cmd.codec)
+
+
+def open_decompressor(archive: str | BinaryIO, codec: str) -> BinaryIO:
+    """Open an archive through an in-process decompressor.
+
+    @param archive: the compressed file or stream to open
+    @param codec: name of the compression codec
+
+    @return: a readable decompressed stream
+    """
+
+    if codec == "gzip":
+        return gzip.open(archive, "rb")
+    if codec == "bz2":
+        return bz2.open(archive, "rb")
+    if codec == "xz":
+        return lzma.open(archive, "rb")
+    if codec == "zstd" and zstandard is not None:
+        # like the other codecs, only close a file opened here
+        closefd = isinstance(archive, str)
+        if closefd:
+            archive = open(archive, "rb")
+        decompressor = zstandard.ZstdDecompressor(max_window_size=ZSTD_MAX_WINDOW)
+        return decompressor.stream_reader(archive, closefd=closefd)
+
+    raise ValueError(f"unsupported codec: {codec!r}")
+
+
+def enlarge_pipe(fd: int) -> None:
+    """Grow a pipe's buffer so its writer is woken up less often.
+
+    @param fd: either end of the pipe
+
+    @return: None
+    """
+
+    if fcntl is None or not hasattr(fcntl, "F_SETPIPE_SZ"):
+        return
+
+    # the kernel may refuse sizes above its pipe-max-size setting
+    try:
+        _ = fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, PIPE_BUFSIZE)
+    except OSError:
+        pass
+
+
+@contextlib.contextmanager
+def open_sequential(archive: str) -> Iterator[BinaryIO]:
+    """Open an archive that is read once from start to end.
+
+    The kernel is told to read ahead aggressively while the archive is
+    open and to drop it from the page cache once it has been extracted.
+
+    @param archive: the archive to be opened
+
+    @return: unbuffered binary file object
+    """
+
+    with open(archive, "rb", buffering=0) as infile:
+        if not hasattr(os, "posix_fadvise"):
+            yield infile
+            return
+
+        fd = infile.fileno()
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        try:
+            yield infile
+        finally:
+            if not infile.closed:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def extract_tar(stream: BinaryIO, mode: str) -> None:
+    """Extract a tar archive in a single sequential pass over a stream.
+
+    @param stream: readable stream of the tar archive
+    @param mode: tarfile stream mode, e.g. "r|" or "r|gz" for compressed tars
+
+    @return: None
+    """
+
+    with tarfile.open(
+        fileobj=stream, mode=mode, bufsize=COPY_BUFSIZE, copybufsize=COPY_BUFSIZE
+    ) as tar:
+        tar.extractall(filter="data")
+
+
+def extract_in_process(archive: str, archive_cmd: ArchiveCommand, target: str) -> None:
+    """Extract an archive with Python's own decompressors.
+
+    @param archive: the archive to be extracted
+    @param archive_cmd: a completed ArchiveCommand object
+    @param target: output file for single stream archives
+
+    @return: None
+    """
+
+    with open_sequential(archive) as infile:
+        extract_stream(infile, archive_cmd, target)
+
+
+def extract_stream(stream: BinaryIO, archive_cmd: ArchiveCommand, target: str) -> None:
+    """Extract an archive read sequentially from a stream.
+
+    @param stream: readable stream of the compressed archive
+    @param archive_cmd: a completed ArchiveCommand object
+    @param target: output file for single stream archives
+
+    @return: None
+    """
+
+    if can_extract_in_process(archive_cmd):
+        # tarfile natively handles gzip, bzip2 and xz compression, named
+        # explicitly since autodetection misses lzma data with small dictionaries
+        if archive_cmd.is_tar and archive_cmd.codec != "zstd":
+            extract_tar(stream, "r|" + TARFILE_COMPRESSION.get(archive_cmd.codec, ""))
+            return
+
+        with open_decompressor(stream, archive_cmd.codec) as decompressed:
+            if archive_cmd.is_tar:
+                extract_tar(decompressed, "r|")
+            else:
+                with open(target, "wb") as outfile:
+                    shutil.copyfileobj(decompressed, outfile, length=COPY_BUFSIZE)
+        return
+
+    # feed the stream to the external decompressor's stdin
+    extract_cmd = resolve_command(archive_cmd.extract_argv)
+    outfile = open(target, "wb", buffering=0) if archive_cmd.uses_stdout else None
+    try:
+        with subprocess.Popen(
+            extract_cmd,
+            stdin=subprocess.PIPE,
+            stdout=outfile,
+            bufsize=COPY_BUFSIZE,
+        ) as cmd:
+            enlarge_pipe(cmd.stdin.fileno())
+            shutil.copyfileobj(stream, cmd.stdin, length=COPY_BUFSIZE)
+    finally:
+        if outfile is not None:
+            outfile.close()
+
+    if cmd.returncode != 0:
+        raise subprocess.CalledProcessError(cmd.returncode, extract_cmd)
+
+
+def sniff(archive: str) -> str | None:
+    """Identify an archive's format from its leading bytes.
+
+    @param archive: the archive to be examined
+
+    @return: name of the archive format or None if unknown
+    """
+
+    try:
+        with open(archive, "rb") as f:
+            header = f.read(262)
+    except OSError:
+        return None
+
+    for offset, magic, archive_format in MAGIC_NUMBERS:
+        if header.startswith(magic, offset):
+            return archive_format
+
+    return None
+
+
+def contains_tar(archive: str, codec: str) -> bool:
+    """Test if a compressed archive holds a tar archive.
+
+    @param archive: the compressed archive to be examined
+    @param codec: name of the compression codec
+
+    @return: boolean True if the decompressed data is a tar archive
+    """
+
+    try:
+        with open_decompressor(archive, codec) as stream:
+            header = stream.read(262)
+    except (*DECOMPRESSION_ERRORS, ValueError):
+        return False
+
+    return header.startswith(b"ustar", 257)
+
+
+def identify_command(archive: str) -> ArchiveCommand | None:
+    """Find the ArchiveCommand for an archive by its contents and filename.
+
+    The filename decides when it agrees with the archive's contents,
+    telling apart a compressed tar archive from a single compressed file.
+    Contents are only examined for files with an archive suffix or with no
+    extension at all.
+
+    @param archive: the archive to be examined
+
+    @return: matching ArchiveCommand or None
+    """
+
+    filename = os.path.basename(archive).lower()
+    command = find_command(filename)
+
+    # files such as .docx, .whl or .a are zip or ar archives inside,
+    # any extension that isn't an archive suffix means it isn't one
+    if command is None and os.path.splitext(filename)[1]:
+        return None
+
+    archive_format = sniff(archive)
+    if archive_format is None or filename.endswith(FORMAT_SUFFIXES[archive_format]):
+        return command
+
+    logging.info("Archive %s contains %s data", archive, archive_format)
+
+    suffixes = FORMAT_SUFFIXES[archive_format]
+    if suffixes[0].startswith(".tar.") and contains_tar(archive, archive_format):
+        return find_command(suffixes[0])
+
+    return find_command(suffixes[-1])
+
+
 def simple_extract(
     archive: str, archive_cmd: ArchiveCommand, no_clobber: bool = False
 ) -> None:
@@ -177,12 +735,17 @@ def simple_extract(
     uses_stdin = archive_cmd.uses_stdin
     uses_stdout = archive_cmd.uses_stdout
 
-    if uses_stdin or uses_stdout:
-        extract_cmd = shlex.split(archive_cmd.extract_cmd)
-    else:
-        extract_cmd = shlex.split(archive_cmd.extract_cmd + " " + archive)
+    extract_argv = archive_cmd.extract_argv
+    if not (uses_stdin or uses_stdout):
+        # stdin is never a terminal, so answer overwrite prompts up front,
+        # existing files are replaced unless no_clobber is set
+        overwrite, keep = OVERWRITE_COMMANDS.get(
+            extract_argv[0], (archive_cmd.extract_cmd, archive_cmd.extract_cmd)
+        )
+        extract_argv = shlex.split(keep if no_clobber else overwrite) + [archive]
+    extract_cmd = resolve_command(extract_argv)
 
-    pipe_cmd = shlex.split(archive_cmd.pipe_cmd)
+    pipe_cmd = resolve_command(archive_cmd.pipe_argv) if archive_cmd.pipe_argv else []
 
     target = strip_suffix(archive)
 
@@ -192,87 +755,257 @@ def simple_extract(
         logging.warning("Target: %s already exists not overwriting...", target)
         return
 
-    # Extract archive
-    with open(archive, encoding="utf8") as infile:
-        if not pipe_cmd:
-            if uses_stdin and not uses_stdout:
-                try:
-                    _ = subprocess.run(extract_cmd, stdin=infile, check=True)
-                except OSError as e:
-                    logging.warning(
-                        "Errno %d: %s - %s", e.errno, e.strerror, extract_cmd
-                    )
-                return
+    # Decompress in-process when a suitable codec is available
+    if can_extract_in_process(archive_cmd):
+        try:
+            extract_in_process(archive, archive_cmd, target)
+        except DECOMPRESSION_ERRORS as e:
+            logging.warning("Error: failed to extract %s - %s", archive, e)
+            if not archive_cmd.is_tar and os.path.exists(target):
+                os.remove(target)
+        return
 
-            if uses_stdin and uses_stdout:
-                with open(target, "w+", encoding="utf8") as outfile:
-                    try:
-                        _ = subprocess.run(
-                            extract_cmd,
-                            stdin=infile,
-                            stdout=outfile,
-                            check=True,
-                        )
-                    except OSError as e:
-                        logging.warning(
-                            "Errno %d: %s - %s", e.errno, e.strerror, extract_cmd
-                        )
-                        os.remove(target)
-                    return
-            else:
+    # Extract archive with a single extract command, its stdin is the
+    # archive and its stdout the target, the pipe command or the terminal,
+    # commands given the archive as an argument never have it opened here
+    stdin_archive = (
+        open_sequential(archive)
+        if uses_stdin or pipe_cmd
+        else contextlib.nullcontext(subprocess.DEVNULL)
+    )
+    with stdin_archive as stdin:
+        # Piped command, both tools share a kernel pipe so the data
+        # moves between them without passing through Python
+        read_fd, write_fd = os.pipe() if pipe_cmd else (-1, -1)
+        if pipe_cmd:
+            enlarge_pipe(write_fd)
+        outfile = (
+            open(target, "wb", buffering=0) if uses_stdout and not pipe_cmd else None
+        )
+        stdout = write_fd if pipe_cmd else outfile
+
+        try:
+            cmd = subprocess.Popen(extract_cmd, stdin=stdin, stdout=stdout)
+        except OSError as e:
+            logging.warning("Errno %d: %s - %s", e.errno, e.strerror, extract_cmd)
+            if pipe_cmd:
+                os.close(read_fd)
+            elif outfile is not None:
+                os.remove(target)
+            return
+        finally:
+            if pipe_cmd:
+                os.close(write_fd)
+            elif outfile is not None:
+                outfile.close()
+
+        with cmd:
+            if pipe_cmd:
                 try:
-                    _ = subprocess.run(extract_cmd, check=True)
+                    _ = subprocess.run(pipe_cmd, stdin=read_fd, check=True)
                 except OSError as e:
+                    logging.warning("Errno %d: %s -> %s", e.errno, e.strerror, pipe_cmd)
+                except subprocess.CalledProcessError as e:
                     logging.warning(
-                        "Errno %d: %s - %s", e.errno, e.strerror, extract_cmd
+                        "Error: %s exited with status %d", pipe_cmd[0], e.returncode
                     )
-                return
+                finally:
+                    os.close(read_fd)
+
+    if cmd.returncode != 0:
+        logging.warning(
+            "Error: %s exited with status %d", extract_cmd[0], cmd.returncode
+        )
+        if outfile is not None and os.path.exists(target):
+            os.remove(target)
+
+
+def metadata_path(archive: str) -> str:
+    """Get the path of the sidecar file holding an archive's HTTP metadata.
+
+    @param archive: local archive path
+
+    @return: path of the metadata file
+    """
+
+    return archive + METADATA_SUFFIX
+
+
+def save_metadata(archive: str, response: http.client.HTTPResponse) -> None:
+    """Store the cache validators of a downloaded archive.
+
+    @param archive: local archive path
+    @param response: response the archive was downloaded from
+
+    @return: None
+    """
+
+    metadata = {
+        "etag": response.headers["etag"],
+        "last_modified": response.headers["last-modified"],
+        "size": os.path.getsize(archive),
+    }
+
+    if not metadata["etag"] and not metadata["last_modified"]:
+        return
+
+    with open(metadata_path(archive), "w", encoding="utf8") as f:
+        json.dump(metadata, f)
+
+
+def add_validators(request: urllib.request.Request, archive: str) -> None:
+    """Make a request conditional on the archive having changed.
+
+    The server then answers 304 Not Modified without sending the
+    archive again when the local copy is current.
+
+    @param request: request for the archive's url
+    @param archive: local archive that may not need downloaded
+
+    @return: None
+    """
+
+    try:
+        with open(metadata_path(archive), encoding="utf8") as f:
+            metadata = json.load(f)
+        local_size = os.path.getsize(archive)
+    except (OSError, ValueError):
+        return
+
+    # metadata describes an older copy of the archive
+    if metadata.get("size") != local_size:
+        return
+
+    if metadata.get("etag"):
+        request.add_header("If-None-Match", metadata["etag"])
+    if metadata.get("last_modified"):
+        request.add_header("If-Modified-Since", metadata["last_modified"])
+
+
+def range_validator(etag: str | None, last_modified: str | None) -> str | None:
+    """Pick the validator an If-Range header can use.
+
+    @param etag: the archive's ETag header
+    @param last_modified: the archive's Last-Modified header
+
+    @return: strong etag or last modified date, None if there is neither
+    """
+
+    # weak etags can't be used to request a range
+    if etag and not etag.startswith("W/"):
+        return etag
+
+    return last_modified or None
+
+
+def add_resume_validator(request: urllib.request.Request, partial: str) -> int:
+    """Make a request continue an interrupted download.
+
+    The range asks only for the bytes still missing, and If-Range makes
+    the server send the whole archive instead if it has changed since.
+
+    @param request: request for the archive's url
+    @param partial: partially downloaded archive
+
+    @return: offset the download resumes from, 0 to start over
+    """
+
+    try:
+        with open(metadata_path(partial), encoding="utf8") as f:
+            metadata = json.load(f)
+        local_size = os.path.getsize(partial)
+    except (OSError, ValueError):
+        return 0
+
+    validator = range_validator(metadata.get("etag"), metadata.get("last_modified"))
+    if not validator or not local_size:
+        return 0
+
+    request.add_header("Range", f"bytes={local_size}-")
+    request.add_header("If-Range", validator)
+
+    return local_size
+
+
+def get_range_start(response: http.client.HTTPResponse) -> int:
+    """Get the offset of the first byte in a ranged response.
+
+    @param response: open response to a request for the archive
 
-        # Piped command
-        with subprocess.Popen(extract_cmd, stdin=infile, stdout=subprocess.PIPE) as cmd:
-            try:
-                _ = subprocess.run(pipe_cmd, stdin=cmd.stdout, check=True)
-            except OSError as e:
-                logging.warning("Errno %d: %s -> %s", e.errno, e.strerror, extract_cmd)
+    @return: offset of the first byte sent, 0 for a complete response
+    """
+
+    # content-range looks like "bytes 100-999/1000"
+    content_range = response.headers["content-range"]
+    if not content_range:
+        return 0
+
+    start = content_range.partition(" ")[2].partition("-")[0]
+
+    return int(start) if start.isdigit() else 0
+
+
+def get_remote_size(response: http.client.HTTPResponse) -> int | None:
+    """Get the complete size of a remote archive from its response headers.
+
+    @param response: open response to a request for the archive
+
+    @return: size in bytes, or None if the server did not report it
+    """
+
+    # a ranged response carries the complete size after the slash
+    # in its content-range
+    remote_size = response.headers["content-length"]
+    if response.headers["content-range"]:
+        remote_size = response.headers["content-range"].rpartition("/")[2]
+
+    if not remote_size or not remote_size.isdigit():
+        return None
+
+    return int(remote_size)
+
+
+def preallocate_file(outfile: BinaryIO, size: int | None) -> None:
+    """Reserve disk space for a file that is about to be written.
 
+    @param outfile: file opened for writing
+    @param size: final size of the file in bytes, if known
 
-def should_fetch_url(archive_url: str, local_archive: str) -> bool:
+    @return: None
+    """
+
+    if not size or not hasattr(os, "posix_fallocate"):
+        return
+
+    # preallocation is only a layout hint, not every filesystem supports it
+    try:
+        os.posix_fallocate(outfile.fileno(), 0, size)
+    except OSError:
+        pass
+
+
+def should_fetch_url(response: http.client.HTTPResponse, local_archive: str) -> bool:
     """Check if an archive should be fetched by comparing
     remote and local file sizes.
 
-    @param archive_url: url of archive to be downloaded
+    @param response: open response to a request for the archive
     @param local_archive: local archive that may not need downloaded
 
     @return: boolean True if archive should be downloaded, False otherwise
     """
 
-    logging.info("Validating archive url: %s", archive_url)
+    logging.info("Validating archive url: %s", response.url)
 
-    # get content-size of remote archive
-    req = urllib.request.Request(archive_url, method="HEAD")
-    try:
-        f: urllib.request.Request
-        with urllib.request.urlopen(req) as f:
-            if not f.headers["content-length"]:
-                logging.warning(
-                    "Error: invalid archive content-length, skipping download"
-                )
-                return False
-
-            remote_size: str = f.headers["content-length"]
-    except urllib.error.HTTPError as e:
-        logging.warning("Error: The server couldn't fulfill the request")
-        logging.warning("Error Code: %d", e.code)
-        return False
-    except urllib.error.URLError as e:
-        logging.warning("Error: failed to reach the server")
-        logging.warning("Reason: %s", e.reason)
-        return False
-
-    # archive should be fetched if a local copy does not exist
+    # archive should be fetched if a local copy does not exist,
+    # there is nothing to compare the remote size against
     if not os.path.exists(local_archive):
         return True
 
+    remote_size = get_remote_size(response)
+    if remote_size is None:
+        logging.warning("Error: invalid archive content-length, downloading anyway")
+        return True
+
     # get size of local archive
     local_size = os.path.getsize(local_archive)
 
@@ -280,7 +1013,7 @@ def should_fetch_url(archive_url: str, local_archive: str) -> bool:
     logging.info("remote size: %d, local size: %d", remote_size, local_size)
 
     # compare remote and local sizes, if equal return False
-    if int(remote_size) == int(local_size):
+    if remote_size == local_size:
         logging.warning("Archive sizes are the same. Skipping download...")
         return False
 
@@ -289,38 +1022,231 @@ def should_fetch_url(archive_url: str, local_archive: str) -> bool:
     return True
 
 
-def make_download_command(url: str, silent_download: bool = False) -> list[str] | None:
-    """Make a valid command line string to download a url.
+@functools.lru_cache(maxsize=1)
+def download_program() -> str | None:
+    """Find the preferred installed download program.
+
+    @return: name of the download program, None if none are installed
+    """
+
+    return next(filter(command_exists, DOWNLOAD_PROGRAMS), None)
+
+
+def make_download_command(
+    url: str, target: str, silent_download: bool = False, parallel: bool = False
+) -> list[str] | None:
+    """Make a valid command line to download a url to a file.
 
     @param url: url of archive to be downloaded
+    @param target: file the download program writes the archive to
     @param silent_download: boolean switch to suppress download output
+    @param parallel: boolean switch to prefer a multi-connection downloader
 
-    @return: command string or None
-    """
-
-    # determine which download tool to use
-    if command_exists("curl"):
-        if silent_download:
-            fetch_cmd = shlex.split("curl -L -s -o -" + " " + url)
-        else:
-            fetch_cmd = shlex.split("curl -L -o -" + " " + url)
-    elif command_exists("wget"):
-        if silent_download:
-            fetch_cmd = shlex.split("wget -q -O -" + " " + url)
-        else:
-            fetch_cmd = shlex.split("wget -O -" + " " + url)
-    elif command_exists("fetch"):
-        if silent_download:
-            fetch_cmd = shlex.split("fetch -q -o -" + " " + url)
-        else:
-            fetch_cmd = shlex.split("fetch -o -" + " " + url)
+    @return: command line split into arguments or None
+    """
+
+    # determine which download tool to use, probed once per run
+    program = download_program()
+    if parallel and command_exists("aria2c"):
+        fetch_cmd = [
+            "aria2c",
+            f"--max-connection-per-server={PARALLEL_CONNECTIONS}",
+            f"--split={PARALLEL_CONNECTIONS}",
+            "--min-split-size=1M",
+            "--allow-overwrite=true",
+            "--auto-file-renaming=false",
+            "-o",
+            target,
+            url,
+        ]
+    elif program == "curl":
+        fetch_cmd = ["curl", "-f", "-L", "-o", target, url]
+    elif program == "wget":
+        fetch_cmd = ["wget", "-O", target, url]
+    elif program == "fetch":
+        fetch_cmd = ["fetch", "-o", target, url]
     else:
         logging.error("Error: no suitable download program found")
         return None
 
+    # every supported program takes its quiet option first
+    if silent_download:
+        fetch_cmd.insert(1, "-s" if fetch_cmd[0] == "curl" else "-q")
+
     return fetch_cmd
 
 
+def copy_response(
+    response: http.client.HTTPResponse,
+    outfile: BinaryIO,
+    name: str,
+    silent_download: bool = False,
+) -> None:
+    """Write a downloaded archive to disk.
+
+    @param response: open response to a request for the archive
+    @param outfile: file the archive is written to
+    @param name: archive name shown in the progress output
+    @param silent_download: boolean switch to suppress download progress
+
+    @return: None
+    """
+
+    # a progress line rewritten in place only makes sense on a terminal
+    if silent_download or not sys.stderr.isatty():
+        shutil.copyfileobj(response, outfile, length=COPY_BUFSIZE)
+    else:
+        total = response.headers["content-length"]
+        received = 0
+        while chunk := response.read(COPY_BUFSIZE):
+            _ = outfile.write(chunk)
+            received += len(chunk)
+            if total and total.isdigit():
+                progress = f"{received:,} of {int(total):,} bytes"
+            else:
+                progress = f"{received:,} bytes"
+            print(f"\r{name}: {progress}", end="", file=sys.stderr, flush=True)
+
+        print(file=sys.stderr)
+
+    # reads stop short without an error when the connection drops, the
+    # bytes still expected show the archive is incomplete
+    if response.length:
+        raise http.client.IncompleteRead(b"", response.length)
+
+
+def fetch_archive_with_tool(
+    url: str, target: str, silent_download: bool = False, parallel: bool = False
+) -> bool:
+    """Download an archive using an external download program.
+
+    @param url: url of archive to be downloaded
+    @param target: file to save the archive to
+    @param silent_download: boolean switch to quiet download output
+    @param parallel: boolean switch to prefer a multi-connection downloader
+
+    @return: boolean True if successful, False otherwise
+    """
+
+    fetch_cmd = make_download_command(
+        url, target, silent_download=silent_download, parallel=parallel
+    )
+
+    if fetch_cmd is None:
+        return False
+
+    fetch_cmd = resolve_command(fetch_cmd)
+
+    # the download program writes the file itself, nothing passes through Python
+    try:
+        _ = subprocess.run(fetch_cmd, stdin=subprocess.DEVNULL, check=True)
+    except OSError as e:
+        logging.warning("Errno %d: %s - %s", e.errno, e.strerror, fetch_cmd)
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+    except subprocess.CalledProcessError as e:
+        logging.warning("Error: %s exited with status %d", fetch_cmd[0], e.returncode)
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+
+    return True
+
+
+def fetch_range(url: str, fd: int, start: int, end: int, validator: str) -> None:
+    """Download one byte range of an archive into its place in a file.
+
+    @param url: url of archive to be downloaded
+    @param fd: file descriptor the archive is written to
+    @param start: offset of the first byte of the range
+    @param end: offset of the last byte of the range
+    @param validator: etag or last modified date the range must belong to
+
+    @return: None
+    """
+
+    # If-Range makes a server send the whole archive instead of the range
+    # if it has changed, so ranges of different versions are never mixed
+    request = urllib.request.Request(
+        url,
+        headers={
+            "Range": f"bytes={start}-{end}",
+            "If-Range": validator,
+            "Accept-Encoding": "identity",
+        },
+    )
+    offset = start
+    with urllib.request.urlopen(request) as response:
+        if response.status != 206:
+            raise http.client.HTTPException(
+                f"range {start}-{end} was not honoured, the archive may have changed"
+            )
+        while offset <= end and (
+            chunk := response.read(min(COPY_BUFSIZE, end + 1 - offset))
+        ):
+            view = memoryview(chunk)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+
+    if offset != end + 1:
+        raise http.client.IncompleteRead(b"", end + 1 - offset)
+
+
+def fetch_archive_in_parallel(url: str, target: str, size: int, validator: str) -> None:
+    """Download an archive over several connections at once.
+
+    The file is sized up front and each connection writes its own
+    byte range in place with os.pwrite.
+
+    @param url: url of archive to be downloaded
+    @param target: file to save the archive to
+    @param size: complete size of the archive in bytes
+    @param validator: etag or last modified date of the archive's version
+
+    @return: None
+    """
+
+    # one range per connection, rounded up so the last range is the short one
+    range_size = -(-size // PARALLEL_CONNECTIONS)
+    starts = range(0, size, range_size)
+    ends = [min(start + range_size, size) - 1 for start in starts]
+
+    logging.info("Fetching %s over %d connections", target, len(starts))
+
+    fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(starts)) as executor:
+            _ = list(
+                executor.map(
+                    fetch_range,
+                    itertools.repeat(url),
+                    itertools.repeat(fd),
+                    starts,
+                    ends,
+                    itertools.repeat(validator),
+                )
+            )
+    finally:
+        os.close(fd)
+
+
+def remove_unresumable(partial: str) -> None:
+    """Remove a failed download that a later run could not resume.
+
+    @param partial: partially downloaded archive
+
+    @return: None
+    """
+
+    # keep a partial file that a later run can resume
+    if os.path.exists(partial) and not os.path.exists(metadata_path(partial)):
+        os.remove(partial)
+
+
 def fetch_archive(
     url: str, silent_download: bool = False, force_download: bool = False
 ) -> str | None:
@@ -333,34 +1259,205 @@ def fetch_archive(
     @return: None if failure, target archive if successful
     """
 
-    _, target = os.path.split(url)
-
-    fetch_cmd = make_download_command(url, silent_download=silent_download)
+    target = url_filename(url)
 
-    if fetch_cmd is None:
-        return None
+    # downloads are written to a partial file that replaces the target
+    # only once complete, an interrupted download never looks finished
+    partial = target + PARTIAL_SUFFIX
 
-    # Check if an archive should be downloaded
-    if not force_download:
-        logging.info("Checking if archive should be downloaded")
-        if not should_fetch_url(url, target):
+    # leave schemes other than http to the external download programs
+    if urllib.parse.urlsplit(url).scheme not in ("http", "https"):
+        logging.info("Fetching archive %s", target)
+        if not fetch_archive_with_tool(url, partial, silent_download=silent_download):
             return None
+        os.replace(partial, target)
+        logging.info("Fetched archive %s", target)
+        return target
+
+    # One ranged GET both reports the archive size and, when the archive
+    # needs downloading, streams its contents; no separate HEAD request.
+    # Asking for an unencoded body keeps the reported size that of the archive
+    request = urllib.request.Request(
+        url, headers={"Range": "bytes=0-", "Accept-Encoding": "identity"}
+    )
+    resume_from = 0 if force_download else add_resume_validator(request, partial)
+    if not resume_from and not force_download:
+        add_validators(request, target)
 
-    logging.info("Fetching archive %s", target)
-
-    with open(target, "w+", encoding="utf8") as outfile:
-        try:
-            _ = subprocess.run(
-                fetch_cmd, stdin=subprocess.PIPE, stdout=outfile, check=True
+    try:
+        with urllib.request.urlopen(request) as response:
+            # Check if an archive should be downloaded, a conditional request
+            # that wasn't answered with 304 means the archive has changed even
+            # if its size has not
+            conditional = request.has_header("If-none-match") or request.has_header(
+                "If-modified-since"
             )
-        except OSError as e:
-            logging.warning("Errno %d: %s - %s", e.errno, e.strerror, fetch_cmd)
-            os.remove(target)
+            if not force_download and not conditional:
+                logging.info("Checking if archive should be downloaded")
+                if not should_fetch_url(response, target):
+                    return None
+
+            logging.info("Fetching archive %s", target)
+
+            # a large archive on a server that honours ranges is fetched
+            # over several connections, by aria2c when it is installed
+            remote_size = get_remote_size(response)
+            validator = range_validator(
+                response.headers["etag"], response.headers["last-modified"]
+            )
+            parallel = (
+                response.status == 206
+                and remote_size is not None
+                and remote_size >= PARALLEL_DOWNLOAD_SIZE
+            )
+            if (
+                response.status == 206
+                and resume_from
+                and get_range_start(response) == resume_from
+            ):
+                logging.info("Resuming archive %s at byte %d", target, resume_from)
+                with open(partial, "ab", buffering=COPY_BUFSIZE) as outfile:
+                    copy_response(
+                        response, outfile, target, silent_download=silent_download
+                    )
+            elif parallel and command_exists("aria2c"):
+                # free the first connection before opening the parallel ones
+                response.close()
+                if not fetch_archive_with_tool(
+                    url, partial, silent_download=silent_download, parallel=True
+                ):
+                    return None
+            elif parallel and validator and hasattr(os, "pwrite"):
+                response.close()
+                fetch_archive_in_parallel(url, partial, remote_size, validator)
+            else:
+                with open(partial, "wb", buffering=COPY_BUFSIZE) as outfile:
+                    # a sequentially written partial file can be resumed
+                    save_metadata(partial, response)
+                    preallocate_file(outfile, remote_size)
+                    try:
+                        copy_response(
+                            response, outfile, target, silent_download=silent_download
+                        )
+                    finally:
+                        # drop any preallocated space the response did not
+                        # fill, leaving only the bytes received to resume from
+                        _ = outfile.truncate()
+
+            os.replace(partial, target)
+            save_metadata(target, response)
+            if os.path.exists(metadata_path(partial)):
+                os.remove(metadata_path(partial))
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            logging.warning("Archive has not been modified. Skipping download...")
+            return None
+        if e.code == 416 and resume_from:
+            logging.warning("Error: cannot resume %s, downloading again", target)
+            os.remove(metadata_path(partial))
+            return fetch_archive(url, silent_download, force_download)
+        logging.warning("Error: The server couldn't fulfill the request")
+        logging.warning("Error Code: %d", e.code)
+        remove_unresumable(partial)
+        return None
+    except urllib.error.URLError as e:
+        logging.warning("Error: failed to reach the server")
+        logging.warning("Reason: %s", e.reason)
+        logging.info("Retrying archive %s with an external program", target)
+        if not fetch_archive_with_tool(url, partial, silent_download=silent_download):
             return None
+        os.replace(partial, target)
+    except (OSError, http.client.HTTPException) as e:
+        logging.warning("Error: failed to download %s - %s", url, e)
+        remove_unresumable(partial)
+        return None
 
+    logging.info("Fetched archive %s", target)
     return target
 
 
+def fetch_and_extract(
+    url: str, archive_cmd: ArchiveCommand, no_clobber: bool = False
+) -> None:
+    """Extract a remote archive while it is being downloaded.
+
+    @param url: url of archive to be downloaded
+    @param archive_cmd: a completed ArchiveCommand object
+    @param no_clobber: boolean option not to overwrite existing files
+
+    @return: None
+    """
+
+    target = strip_suffix(url_filename(url))
+
+    logging.info("Streaming archive %s", url)
+    logging.info("Target: %s", target)
+
+    if os.path.exists(target) and no_clobber:
+        logging.warning("Target: %s already exists not overwriting...", target)
+        return
+
+    try:
+        with urllib.request.urlopen(url) as response:
+            extract_stream(response, archive_cmd, target)
+    except urllib.error.HTTPError as e:
+        logging.warning("Error: The server couldn't fulfill the request")
+        logging.warning("Error Code: %d", e.code)
+    except urllib.error.URLError as e:
+        logging.warning("Error: failed to reach the server")
+        logging.warning("Reason: %s", e.reason)
+    except (*DECOMPRESSION_ERRORS, subprocess.CalledProcessError) as e:
+        logging.warning("Error: failed to extract %s - %s", url, e)
+        if not archive_cmd.is_tar and os.path.exists(target):
+            os.remove(target)
+
+
+def stream_archives(paths: list[str], no_clobber: bool = False) -> list[str]:
+    """Concurrently download and extract remote archives without saving them.
+
+    Archives that can't be read from a stream are left to be
+    downloaded and extracted as usual.
+
+    @param paths: a list of paths to archives
+    @param no_clobber: boolean option not to overwrite existing files
+
+    @return: a list of paths that were not streamed
+    """
+
+    remaining: list[str] = []
+    urls: list[str] = []
+    commands: list[ArchiveCommand] = []
+    targets: set[str] = set()
+
+    for path in paths:
+        url = next(iter(extract_urls([path])), None)
+        archive_cmd = find_command(url_filename(url)) if url else None
+        if (
+            url is None
+            or archive_cmd is None
+            or archive_cmd.pipe_cmd
+            or not (archive_cmd.uses_stdin or can_extract_in_process(archive_cmd))
+            or strip_suffix(url_filename(url)) in targets
+        ):
+            # archives sharing a target with a streamed one are extracted later
+            remaining.append(path)
+            continue
+        targets.add(strip_suffix(url_filename(url)))
+        urls.append(url)
+        commands.append(archive_cmd)
+
+    if urls:
+        max_workers = min(len(urls), MAX_DOWNLOADS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            _ = list(
+                executor.map(
+                    fetch_and_extract, urls, commands, itertools.repeat(no_clobber)
+                )
+            )
+
+    return remaining
+
+
 def extract_urls(args: list[str]) -> list[str]:
     """Extract urls from a sequence.
 
@@ -369,13 +1466,18 @@ def extract_urls(args: list[str]) -> list[str]:
     @return: list of valid urls to download
     """
 
-    possibles = [urllib.parse.urlsplit(x) for x in args]
-    unfiltered = [x if x.scheme and x.netloc and x.path else None for x in possibles]
-    processed_urls = list(filter(lambda x: x is not None, unfiltered))
+    return [match.group() for arg in args if (match := URL_RE.match(arg))]
 
-    return [
-        x.scheme + "://" + x.netloc + x.path for x in processed_urls if x is not None
-    ]
+
+def url_filename(url: str) -> str:
+    """Get the archive filename a url refers to.
+
+    @param url: url of an archive
+
+    @return: last component of the url's path, without any query string
+    """
+
+    return os.path.basename(urllib.parse.urlsplit(url).path)
 
 
 def process_archives(
@@ -390,106 +1492,130 @@ def process_archives(
     @return: a list of archives and url archives
     """
 
-    # sanitize inputs, silently drop bad paths
-    possibles: list[str] = [os.path.realpath(x) for x in paths]
-    unfiltered = [x if os.path.exists(x) else None for x in possibles]
-    filtered = list(filter(lambda x: x is not None, unfiltered))
-    archives: list[str] = [x for x in filtered if x is not None]
+    # classify arguments once, silently drop bad local paths
+    archives: list[str] = []
+    url_candidates: list[str] = []
+    for arg in paths:
+        if "://" in arg:
+            url_candidates.append(arg)
+            continue
+        try:
+            _ = os.stat(arg)
+        except OSError:
+            continue
+        archives.append(arg)
 
-    # append url archives
-    url_archives = extract_urls(paths)
+    # append url archives, downloads are network bound so fetch them concurrently
+    url_archives = extract_urls(url_candidates)
+
+    # urls sharing a filename would be downloaded over one another
+    downloads: dict[str, str] = {}
     for url in url_archives:
-        target = fetch_archive(
-            url,
-            silent_download=silent_download,
+        name = url_filename(url)
+        if name in downloads:
+            logging.warning("Error: %s is also fetched from %s", name, downloads[name])
+            continue
+        downloads[name] = url
+
+    if downloads:
+        # concurrent downloads would overwrite each other's progress line,
+        # they only log when each archive starts and finishes
+        fetch = functools.partial(
+            fetch_archive,
+            silent_download=silent_download or len(downloads) > 1,
             force_download=force_download,
         )
-        if not target:
-            continue
-        archives.append(target)
+        max_workers = min(len(downloads), MAX_DOWNLOADS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            archives += [
+                target for target in executor.map(fetch, downloads.values()) if target
+            ]
+
+    # drop duplicates, e.g. a url whose download was also passed as a path,
+    # this is the only place paths are made absolute and symlinks resolved
+    archives = list(dict.fromkeys(map(os.path.realpath, archives)))
 
     if not archives:
-        logging.info("Nothing to do.")
-        logging.info("Try passing --help as an argument for more information.")
+        logging.warning("Nothing to do.")
+        logging.warning("Try passing --help as an argument for more information.")
         sys.exit(0)
 
     return archives, url_archives
 
 
-def process_commands(
-    archives: list[str], url_archives: list[str]
-) -> tuple[list[str], list[ArchiveCommand]]:
+def process_commands(archives: list[str]) -> tuple[list[str], list[ArchiveCommand]]:
     """Create ArchiveCommands.
 
     @param archives: a list of local archives
-    @param url_archives: a list of potential archives to download
 
     @return: a tuple of a list of archive files and a list of ArchiveCommands
     """
 
-    working_dir = os.getcwd()
     glob_files: list[str] = []
     commands: list[ArchiveCommand] = []
-    command_map = {
-        "*.tar.bz2": ArchiveCommand(extract_cmd="tar -xvjf -", uses_stdin=True),
-        "*.tbz2": ArchiveCommand(extract_cmd="tar -xvjf -", uses_stdin=True),
-        "*.tbz": ArchiveCommand(extract_cmd="tar -xvjf -", uses_stdin=True),
-        "*.tar.gz": ArchiveCommand(extract_cmd="tar -xvzf -", uses_stdin=True),
-        "*.tgz": ArchiveCommand(extract_cmd="tar -xvzf -", uses_stdin=True),
-        "*.tar.xz": ArchiveCommand(extract_cmd="tar -xvJf -", uses_stdin=True),
-        "*.txz": ArchiveCommand(extract_cmd="tar -xvJf -", uses_stdin=True),
-        "*.tar.lzma": ArchiveCommand(extract_cmd="tar -xvJf -", uses_stdin=True),
-        "*.tar.zst": ArchiveCommand(extract_cmd="tar --zstd -xvf -", uses_stdin=True),
-        "*.tar": ArchiveCommand(extract_cmd="tar -xvf -", uses_stdin=True),
-        "*.rar": ArchiveCommand(extract_cmd="unrar x"),
-        "*.lzh": ArchiveCommand(extract_cmd="lha x"),
-        "*.7z": ArchiveCommand(extract_cmd="7z x"),
-        "*.zip": ArchiveCommand(extract_cmd="unzip"),
-        "*.jar": ArchiveCommand(extract_cmd="unzip"),
-        "*.rpm": ArchiveCommand(extract_cmd="rpm2cpio -", pipe_cmd="cpio -idvm"),
-        "*.deb": ArchiveCommand(extract_cmd="ar -x"),
-        "*.bz2": ArchiveCommand(
-            extract_cmd="bzip2 -d -c -", uses_stdin=True, uses_stdout=True
-        ),
-        "*.gz": ArchiveCommand(
-            extract_cmd="gzip -d -c -", uses_stdin=True, uses_stdout=True
-        ),
-        "*.Z": ArchiveCommand(
-            extract_cmd="gzip -d -c -", uses_stdin=True, uses_stdout=True
-        ),
-        "*.xz": ArchiveCommand(
-            extract_cmd="xz -d -c -", uses_stdin=True, uses_stdout=True
-        ),
-        "*.lzma": ArchiveCommand(
-            extract_cmd="xz -d -c -", uses_stdin=True, uses_stdout=True
-        ),
-        "*.zst": ArchiveCommand(
-            extract_cmd="zstd -d -c -", uses_stdin=True, uses_stdout=True
-        ),
-    }
+    seen: set[str] = set()
 
     # store an archive and an ArchiveCommand to be zipped
     # then passed to simple_extract
     for archive in archives:
         logging.info("Examining archive: %s", archive)
 
-        pathname, filename = os.path.split(archive)
-        if pathname and archive not in url_archives:
-            os.chdir(pathname)
-
-        for extension, command in command_map.items():
-            if filename in glob.glob(extension):
-                if archive not in glob_files:
-                    glob_files.append(archive)
-                    commands.append(command)
+        command = identify_command(archive)
+        if command is not None and archive not in seen:
+            seen.add(archive)
+            glob_files.append(archive)
+            commands.append(command)
 
     logging.info("Archives that can be extracted: %r", glob_files)
 
-    os.chdir(working_dir)
-
     return glob_files, commands
 
 
+def extract_archive(
+    archive: str,
+    archive_cmd: ArchiveCommand,
+    available_cmds: frozenset[str],
+    no_clobber: bool = False,
+) -> None:
+    """Check that an archive can be extracted, then run simple_extract on it.
+
+    @param archive: the archive to be extracted
+    @param archive_cmd: a completed ArchiveCommand object
+    @param available_cmds: root commands known to exist on this system
+    @param no_clobber: boolean option not to overwrite existing files
+
+    @return: None
+    """
+
+    root_cmd = archive_cmd.extract_argv[0]
+    if not can_extract_in_process(archive_cmd) and root_cmd not in available_cmds:
+        logging.warning(
+            "Error: %s does not exist...not extracting %s.", root_cmd, archive
+        )
+        return
+
+    logging.info("Extracting archive %s", archive)
+    simple_extract(archive, archive_cmd, no_clobber=no_clobber)
+
+
+def extract_archives(
+    group: list[tuple[str, ArchiveCommand]],
+    available_cmds: frozenset[str],
+    no_clobber: bool = False,
+) -> None:
+    """Extract archives one after another.
+
+    @param group: archives paired with their ArchiveCommands
+    @param available_cmds: root commands known to exist on this system
+    @param no_clobber: boolean option not to overwrite existing files
+
+    @return: None
+    """
+
+    for archive, archive_cmd in group:
+        extract_archive(archive, archive_cmd, available_cmds, no_clobber=no_clobber)
+
+
 def do_simple_extract(
     glob_files: list[str], commands: list[ArchiveCommand], no_clobber: bool = False
 ) -> None:
@@ -501,16 +1627,34 @@ def do_simple_extract(
     @return: None
     """
 
-    # pass archives and their ArchiveCommand's to simple_extract
-    for archive, archive_cmd in zip(glob_files, commands):
-        root_cmd = archive_cmd.extract_cmd.split()[0]
-        if not command_exists(root_cmd):
-            logging.warning(
-                "Error: %s does not exist...not extracting %s.", root_cmd, archive
+    if not glob_files:
+        return
+
+    # probe each distinct root command once rather than once per archive
+    root_cmds = {command.extract_argv[0] for command in commands}
+    available_cmds = frozenset(filter(command_exists, root_cmds))
+
+    # Only archives decompressed to a single target file, e.g. data.gz, are
+    # known not to write each other's files, those sharing a target such as
+    # data.gz and data.bz2 are still grouped. Tar, zip and other multi-file
+    # archives may write the same paths, they are all extracted serially.
+    groups: dict[str | None, list[tuple[str, ArchiveCommand]]] = {}
+    for archive, command in zip(glob_files, commands):
+        target = strip_suffix(archive) if command.uses_stdout else None
+        groups.setdefault(target, []).append((archive, command))
+
+    # groups are independent, extract them in parallel worker threads,
+    # decompression and waiting on extract commands both release the GIL
+    max_workers = min(len(groups), os.cpu_count() or 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        _ = list(
+            executor.map(
+                extract_archives,
+                groups.values(),
+                itertools.repeat(available_cmds),
+                itertools.repeat(no_clobber),
             )
-            continue
-        logging.info("Extracting archive %s", archive)
-        simple_extract(archive, archive_cmd, no_clobber=no_clobber)
+        )
 
 
 def main() -> None:
@@ -534,14 +1678,15 @@ def main() -> None:
     _ = parser.add_argument(
         "--no-clobber",
         action="store_true",
-        help="Don't overwrite existing files",
+        help="Don't overwrite existing files, by default extracted files replace them",
         dest="no_clobber",
     )
     _ = parser.add_argument(
         "--force-download",
         action="store_true",
         default=False,
-        help="Bypass checks and always download remote archive",
+        help="Bypass checks and always download remote archive, ignoring the "
+        "ARCHIVE.meta.json file kept next to a download to detect changes",
         dest="force_download",
     )
     _ = parser.add_argument(
@@ -551,9 +1696,27 @@ def main() -> None:
         help="Don't show archive download progress",
         dest="silent_download",
     )
+    _ = parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=False,
+        help="Extract remote archives while downloading, without saving them",
+        dest="stream",
+    )
+    _ = parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Show progress messages, repeat for debug output",
+        dest="verbose",
+    )
     _ = parser.add_argument("ARCHIVES", nargs="*")
     opts = vars(parser.parse_args())
 
+    verbosity = min(opts["verbose"], len(VERBOSITY_LEVELS) - 1)
+    logging.getLogger().setLevel(VERBOSITY_LEVELS[verbosity])
+
     start_time = datetime.datetime.now()
     logging.info("Starting simple-extract @ %s", start_time)
 
@@ -561,16 +1724,24 @@ def main() -> None:
     force_download: bool = opts["force_download"]
     silent_download: bool = opts["silent_download"]
     no_clobber: bool = opts["no_clobber"]
+    stream: bool = opts["stream"]
 
-    archives, url_archives = process_archives(
-        paths, force_download=force_download, silent_download=silent_download
-    )
+    streamed = False
+    if stream:
+        remaining = stream_archives(paths, no_clobber=no_clobber)
+        streamed = len(remaining) < len(paths)
+        paths = remaining
+
+    if paths or not streamed:
+        archives, _ = process_archives(
+            paths, force_download=force_download, silent_download=silent_download
+        )
 
-    logging.info("Archives queued for extraction: %r", archives)
+        logging.info("Archives queued for extraction: %r", archives)
 
-    glob_files, commands = process_commands(archives, url_archives)
+        glob_files, commands = process_commands(archives)
 
-    do_simple_extract(glob_files, commands, no_clobber=no_clobber)
+        do_simple_extract(glob_files, commands, no_clobber=no_clobber)
 
     end_time = datetime.datetime.now()
     logging.info("simple-extract finished @ %s", end_time)
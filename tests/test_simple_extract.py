@@ -0,0 +1,593 @@
+"""Tests for simple_extract."""
+
+import functools
+import gzip
+import http.server
+import io
+import json
+import logging
+import lzma
+import os
+import pathlib
+import subprocess
+import sys
+import tarfile
+import threading
+import time
+import urllib.request
+import zipfile
+
+import pytest
+
+from simple_extract import simple_extract as se
+
+PAYLOAD = b"hello world\n" * 1000
+
+
+def corrupt(data: bytes) -> bytes:
+    """Overwrite the bytes following a compressed stream's header.
+
+    @param data: a valid compressed stream
+
+    @return: the stream with its compressed body damaged
+    """
+
+    damaged = bytearray(data)
+    damaged[12:20] = b"\xff" * 8
+    return bytes(damaged)
+
+
+def test_corrupt_gzip_is_reported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    archive = tmp_path / "corrupt.gz"
+    _ = archive.write_bytes(corrupt(gzip.compress(PAYLOAD)))
+    archive_cmd = se.ArchiveCommand(
+        extract_cmd="gzip -d -c -", uses_stdin=True, uses_stdout=True, codec="gzip"
+    )
+
+    se.simple_extract(str(archive), archive_cmd)
+
+    assert not (tmp_path / "corrupt").exists()
+
+
+def test_parallel_decompressor_preferred_over_in_process_codec():
+    parallel = se.ArchiveCommand(
+        extract_cmd="tar -I pigz -xvf -", uses_stdin=True, codec="gzip", is_tar=True
+    )
+    serial = se.ArchiveCommand(
+        extract_cmd="tar -xvzf -", uses_stdin=True, codec="gzip", is_tar=True
+    )
+
+    assert not se.can_extract_in_process(parallel)
+    assert se.can_extract_in_process(serial)
+
+
+@pytest.mark.parametrize(
+    "archive, target",
+    [
+        ("/tmp/a.tar.gz", "a"),
+        ("/tmp/data.GZ", "data"),
+        ("/tmp/data.bin", "data"),
+        ("/tmp/payload", "payload.out"),
+        ("/tmp/.gz", ".gz.out"),
+    ],
+)
+def test_strip_suffix(archive, target):
+    assert se.strip_suffix(archive) == target
+
+
+def test_archive_without_suffix_is_not_overwritten(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    archive = tmp_path / "payload"
+    _ = archive.write_bytes(gzip.compress(PAYLOAD))
+
+    archive_cmd = se.identify_command(str(archive))
+    assert archive_cmd is not None
+    se.simple_extract(str(archive), archive_cmd)
+
+    assert gzip.decompress(archive.read_bytes()) == PAYLOAD
+    assert (tmp_path / "payload.out").read_bytes() == PAYLOAD
+
+
+def test_tar_lzma_with_large_dictionary(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    member = tmp_path / "data.bin"
+    _ = member.write_bytes(PAYLOAD)
+    archive = tmp_path / "a.tar.lzma"
+    with lzma.open(archive, "wb", format=lzma.FORMAT_ALONE, preset=9) as f:
+        with tarfile.open(fileobj=f, mode="w|") as tar:
+            tar.add(member, arcname="out/data.bin")
+
+    se.simple_extract(str(archive), se.find_command(archive.name))
+
+    assert (tmp_path / "out" / "data.bin").read_bytes() == PAYLOAD
+
+
+@pytest.mark.parametrize(
+    "archives",
+    [
+        ["/tmp/a.tar.gz", "/tmp/a.tar.bz2", "/tmp/a.tar.xz"],
+        ["/tmp/a.tar.gz", "/tmp/b.tar.bz2"],
+        ["/tmp/a.zip", "/tmp/b.zip", "/tmp/c.7z"],
+        ["/tmp/data.gz", "/tmp/data.bz2"],
+    ],
+)
+def test_archives_that_may_share_paths_are_extracted_serially(monkeypatch, archives):
+    extracted: list[str] = []
+    running = threading.Lock()
+
+    def extract_archive(archive, archive_cmd, available_cmds, no_clobber=False):
+        assert running.acquire(blocking=False), "shared paths extracted concurrently"
+        time.sleep(0.05)
+        extracted.append(archive)
+        running.release()
+
+    monkeypatch.setattr(se, "extract_archive", extract_archive)
+    monkeypatch.setattr(os, "cpu_count", lambda: len(archives))
+    commands = [se.find_command(os.path.basename(archive)) for archive in archives]
+
+    se.do_simple_extract(archives, commands)
+
+    assert extracted == archives
+
+
+def test_single_file_archives_are_extracted_in_parallel(monkeypatch):
+    both_running = threading.Barrier(2, timeout=5)
+
+    def extract_archive(archive, archive_cmd, available_cmds, no_clobber=False):
+        _ = both_running.wait()
+
+    monkeypatch.setattr(se, "extract_archive", extract_archive)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    archives = ["/tmp/a.gz", "/tmp/b.xz"]
+    commands = [se.find_command(os.path.basename(archive)) for archive in archives]
+
+    se.do_simple_extract(archives, commands)
+
+
+@pytest.mark.skipif(not se.command_exists("unzip"), reason="unzip is not installed")
+@pytest.mark.parametrize("no_clobber, expected", [(False, b"new"), (True, b"old")])
+def test_zip_overwrite_follows_no_clobber(tmp_path, monkeypatch, no_clobber, expected):
+    monkeypatch.chdir(tmp_path)
+    _ = (tmp_path / "data.txt").write_bytes(b"old")
+    archive = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("data.txt", b"new")
+
+    se.simple_extract(str(archive), se.find_command(archive.name), no_clobber)
+
+    assert (tmp_path / "data.txt").read_bytes() == expected
+
+
+def test_zstd_archive(tmp_path, monkeypatch):
+    zstandard = pytest.importorskip("zstandard")
+    monkeypatch.chdir(tmp_path)
+    archive = tmp_path / "data.zst"
+    _ = archive.write_bytes(zstandard.ZstdCompressor().compress(PAYLOAD))
+
+    se.simple_extract(str(archive), se.find_command(archive.name))
+
+    assert (tmp_path / "data").read_bytes() == PAYLOAD
+
+
+def test_corrupt_zstd_is_reported(tmp_path, monkeypatch):
+    zstandard = pytest.importorskip("zstandard")
+    monkeypatch.chdir(tmp_path)
+    archive = tmp_path / "corrupt.zst"
+    compressor = zstandard.ZstdCompressor(write_checksum=True)
+    _ = archive.write_bytes(corrupt(compressor.compress(PAYLOAD)))
+
+    se.simple_extract(str(archive), se.find_command(archive.name))
+
+    assert not (tmp_path / "corrupt").exists()
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serve a payload with validators, byte ranges and If-Range."""
+
+    payload: bytes = PAYLOAD
+    etags: list[str] = []
+    last_modified = "Mon, 02 Sep 2024 10:00:00 GMT"
+    requests: list[dict[str, str]] = []
+    # send only this many bytes of the next response, then drop the connection
+    interrupt_after: int | None = None
+
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+        # each request sees the next etag, the last one repeats
+        etag = self.etags.pop(0) if len(self.etags) > 1 else self.etags[0]
+        if self.headers["If-None-Match"] == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start, end = 0, len(self.payload) - 1
+        ranged = self.headers["Range"] is not None
+        if_range = self.headers["If-Range"]
+        if ranged and if_range in (None, etag):
+            first, _, last = self.headers["Range"][len("bytes=") :].partition("-")
+            start, end = int(first), int(last) if last else end
+        else:
+            ranged = False
+
+        if start >= len(self.payload):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(self.payload)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(206 if ranged else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.send_header("Content-Length", str(end + 1 - start))
+        if ranged:
+            self.send_header(
+                "Content-Range", f"bytes {start}-{end}/{len(self.payload)}"
+            )
+        self.end_headers()
+        body = self.payload[start : end + 1]
+        if self.interrupt_after is not None:
+            body = body[: self.interrupt_after]
+            RangeHandler.interrupt_after = None
+            self.close_connection = True
+        _ = self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def range_server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(se, "command_exists", lambda path: False)
+    monkeypatch.setattr(RangeHandler, "payload", PAYLOAD)
+    monkeypatch.setattr(RangeHandler, "etags", ['"v1"'])
+    monkeypatch.setattr(RangeHandler, "requests", [])
+    monkeypatch.setattr(RangeHandler, "interrupt_after", None)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/archive.gz"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setattr(se, "PARALLEL_DOWNLOAD_SIZE", 1)
+    monkeypatch.setattr(se, "PARALLEL_CONNECTIONS", 4)
+
+
+def test_download_saves_metadata(tmp_path, range_server):
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target == "archive.gz"
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD
+    metadata = json.loads((tmp_path / "archive.gz.meta.json").read_text())
+    assert metadata == {
+        "etag": '"v1"',
+        "last_modified": RangeHandler.last_modified,
+        "size": len(PAYLOAD),
+    }
+
+
+def test_unmodified_archive_is_not_downloaded_again(tmp_path, range_server):
+    _ = se.fetch_archive(range_server, silent_download=True)
+
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target is None
+    assert RangeHandler.requests[-1]["If-None-Match"] == '"v1"'
+    assert RangeHandler.requests[-1]["If-Modified-Since"] == RangeHandler.last_modified
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD
+
+
+def test_modified_archive_of_the_same_size_is_downloaded(tmp_path, range_server):
+    _ = se.fetch_archive(range_server, silent_download=True)
+    RangeHandler.payload = PAYLOAD.upper()
+    RangeHandler.etags = ['"v2"']
+
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target == "archive.gz"
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD.upper()
+
+
+def interrupt_download(url: str, received: int) -> None:
+    """Start downloading an archive and lose the connection part way through.
+
+    @param url: url of the archive
+    @param received: number of bytes received before the connection drops
+
+    @return: None
+    """
+
+    RangeHandler.interrupt_after = received
+    assert se.fetch_archive(url, silent_download=True) is None
+
+
+def test_interrupted_download_is_resumed(tmp_path, range_server):
+    interrupt_download(range_server, 5000)
+    assert (tmp_path / "archive.gz.part").read_bytes() == PAYLOAD[:5000]
+
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target == "archive.gz"
+    assert RangeHandler.requests[-1]["Range"] == "bytes=5000-"
+    assert RangeHandler.requests[-1]["If-Range"] == '"v1"'
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD
+    assert not (tmp_path / "archive.gz.part").exists()
+    assert not (tmp_path / "archive.gz.part.meta.json").exists()
+
+
+def test_changed_archive_is_downloaded_from_the_start(tmp_path, range_server):
+    interrupt_download(range_server, 5000)
+    RangeHandler.payload = PAYLOAD.upper()
+    RangeHandler.etags = ['"v2"']
+
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target == "archive.gz"
+    assert RangeHandler.requests[-1]["If-Range"] == '"v1"'
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD.upper()
+
+
+def test_unsatisfiable_resume_downloads_again(tmp_path, range_server):
+    _ = (tmp_path / "archive.gz.part").write_bytes(PAYLOAD)
+    metadata = {"etag": '"v1"', "last_modified": None, "size": len(PAYLOAD)}
+    _ = (tmp_path / "archive.gz.part.meta.json").write_text(json.dumps(metadata))
+
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target == "archive.gz"
+    assert [request["Range"] for request in RangeHandler.requests] == [
+        f"bytes={len(PAYLOAD)}-",
+        "bytes=0-",
+    ]
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD
+    assert not (tmp_path / "archive.gz.part.meta.json").exists()
+
+
+def test_parallel_download(tmp_path, range_server, parallel):
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target == "archive.gz"
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD
+
+
+def test_parallel_download_of_changing_archive(tmp_path, range_server, parallel):
+    RangeHandler.etags = ['"v1"', '"v1"', '"v2"']
+
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target is None
+    assert not any(tmp_path.iterdir())
+
+
+def test_parallel_download_closes_first_response(range_server, parallel, monkeypatch):
+    responses = []
+    urlopen = urllib.request.urlopen
+    fetch_range = se.fetch_range
+
+    def recording_urlopen(*args, **kwargs):
+        response = urlopen(*args, **kwargs)
+        responses.append(response)
+        return response
+
+    def checked_fetch_range(*args, **kwargs):
+        assert responses[0].isclosed(), "first response still open"
+        fetch_range(*args, **kwargs)
+
+    monkeypatch.setattr(se.urllib.request, "urlopen", recording_urlopen)
+    monkeypatch.setattr(se, "fetch_range", checked_fetch_range)
+
+    assert se.fetch_archive(range_server, silent_download=True) == "archive.gz"
+
+
+def test_parallel_download_with_aria2c(tmp_path, range_server, parallel, monkeypatch):
+    calls: list[list[str]] = []
+
+    def run(argv, **kwargs):
+        calls.append(argv)
+        with open(argv[argv.index("-o") + 1], "wb") as f:
+            _ = f.write(PAYLOAD)
+        return subprocess.CompletedProcess(argv, 0)
+
+    monkeypatch.setattr(se, "command_exists", lambda path: path == "aria2c")
+    monkeypatch.setattr(se.subprocess, "run", run)
+
+    target = se.fetch_archive(range_server, silent_download=True)
+
+    assert target == "archive.gz"
+    assert calls == [
+        [
+            "aria2c",
+            "-q",
+            "--max-connection-per-server=4",
+            "--split=4",
+            "--min-split-size=1M",
+            "--allow-overwrite=true",
+            "--auto-file-renaming=false",
+            "-o",
+            "archive.gz.part",
+            range_server,
+        ]
+    ]
+    assert (tmp_path / "archive.gz").read_bytes() == PAYLOAD
+    assert not (tmp_path / "archive.gz.part").exists()
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve files from a directory without logging requests."""
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def file_server(tmp_path, monkeypatch):
+    served = tmp_path / "served"
+    served.mkdir()
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.chdir(cwd)
+    handler = functools.partial(QuietHandler, directory=str(served))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield served, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_tar_gz(archive, arcname: str) -> None:
+    """Write a gzip compressed tar archive holding PAYLOAD.
+
+    @param archive: path of the archive to write
+    @param arcname: name of PAYLOAD's member in the archive
+
+    @return: None
+    """
+
+    info = tarfile.TarInfo(arcname)
+    info.size = len(PAYLOAD)
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.addfile(info, io.BytesIO(PAYLOAD))
+
+
+def test_stream_tar_gz(file_server):
+    served, base_url = file_server
+    make_tar_gz(served / "a.tar.gz", "out/data.bin")
+
+    remaining = se.stream_archives([f"{base_url}/a.tar.gz"])
+
+    assert remaining == []
+    assert pathlib.Path("out/data.bin").read_bytes() == PAYLOAD
+    assert not pathlib.Path("a.tar.gz").exists()
+
+
+def test_stream_leaves_unstreamable_archives(file_server):
+    served, base_url = file_server
+    with zipfile.ZipFile(served / "a.zip", "w") as zf:
+        zf.writestr("data.txt", PAYLOAD)
+
+    assert se.stream_archives([f"{base_url}/a.zip"]) == [f"{base_url}/a.zip"]
+
+
+@pytest.mark.skipif(not se.command_exists("unzip"), reason="unzip is not installed")
+def test_stream_falls_back_to_download(file_server, monkeypatch):
+    served, base_url = file_server
+    make_tar_gz(served / "a.tar.gz", "out/data.bin")
+    with zipfile.ZipFile(served / "b.zip", "w") as zf:
+        zf.writestr("data.txt", PAYLOAD)
+    urls = [f"{base_url}/a.tar.gz", f"{base_url}/b.zip"]
+    monkeypatch.setattr(sys, "argv", ["simple-extract", "--stream", *urls])
+
+    se.main()
+
+    assert pathlib.Path("out/data.bin").read_bytes() == PAYLOAD
+    assert pathlib.Path("data.txt").read_bytes() == PAYLOAD
+    assert not pathlib.Path("a.tar.gz").exists()
+    assert pathlib.Path("b.zip").exists()
+
+
+@pytest.mark.parametrize("name", ["report.docx", "pkg.whl", "app.apk", "book.epub"])
+def test_zip_based_documents_are_left_alone(tmp_path, name):
+    document = tmp_path / name
+    with zipfile.ZipFile(document, "w") as zf:
+        zf.writestr("content.xml", PAYLOAD)
+
+    assert se.identify_command(str(document)) is None
+
+
+def test_ar_library_is_left_alone(tmp_path):
+    library = tmp_path / "libfoo.a"
+    _ = library.write_bytes(b"!<arch>\n" + PAYLOAD)
+
+    assert se.identify_command(str(library)) is None
+
+
+def test_archive_with_wrong_suffix_is_identified_by_contents(tmp_path):
+    archive = tmp_path / "data.bz2"
+    _ = archive.write_bytes(gzip.compress(PAYLOAD))
+
+    assert se.identify_command(str(archive)) is se.find_command("data.gz")
+
+
+def test_download_progress_only_on_a_terminal(range_server, capsys, monkeypatch):
+    _ = se.fetch_archive(range_server, force_download=True)
+    assert "\r" not in capsys.readouterr().err
+
+    monkeypatch.setattr(sys.stderr, "isatty", lambda: True)
+    _ = se.fetch_archive(range_server, force_download=True)
+    assert "\rarchive.gz: 12,000 of 12,000 bytes" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("count, silent", [(1, False), (2, True)])
+def test_concurrent_downloads_hide_progress(monkeypatch, count, silent):
+    silent_downloads: list[bool] = []
+
+    def fetch_archive(url, silent_download=False, force_download=False):
+        silent_downloads.append(silent_download)
+
+    monkeypatch.setattr(se, "fetch_archive", fetch_archive)
+    urls = [f"http://127.0.0.1/{n}.tar.gz" for n in range(count)]
+
+    with pytest.raises(SystemExit):
+        _ = se.process_archives(urls)
+
+    assert silent_downloads == [silent] * count
+
+
+class FakePopen:
+    """Record the command lines subprocess.Popen is asked to run."""
+
+    calls: list[list[str]] = []
+
+    def __init__(self, argv, **kwargs):
+        self.calls.append(argv)
+        self.returncode = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.mark.parametrize(
+    "name, no_clobber, argv",
+    [
+        ("a.zip", False, ["unzip", "-o"]),
+        ("a.zip", True, ["unzip", "-n"]),
+        ("a.rar", False, ["unrar", "x", "-o+"]),
+        ("a.rar", True, ["unrar", "x", "-o-"]),
+        ("a.7z", False, ["7z", "x", "-y"]),
+        ("a.7z", True, ["7z", "x", "-aos"]),
+        ("a.lzh", False, ["lha", "xf"]),
+        ("a.lzh", True, ["lha", "x"]),
+    ],
+)
+def test_overwrite_prompts_are_answered(tmp_path, monkeypatch, name, no_clobber, argv):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(FakePopen, "calls", [])
+    monkeypatch.setattr(se.subprocess, "Popen", FakePopen)
+    archive = str(tmp_path / name)
+
+    se.simple_extract(archive, se.find_command(name), no_clobber)
+
+    [call] = FakePopen.calls
+    assert [os.path.basename(call[0]), *call[1:]] == [*argv, archive]
+
+
+@pytest.mark.parametrize("args", [[], ["missing.tar.gz"]])
+def test_nothing_to_do_is_reported(tmp_path, monkeypatch, caplog, args):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["simple-extract", *args])
+
+    with pytest.raises(SystemExit) as exit_info:
+        se.main()
+
+    assert exit_info.value.code == 0
+    assert ("root", logging.WARNING, "Nothing to do.") in caplog.record_tuples